@@ -66,11 +66,19 @@ filter_bam_file_for_popscle_dsc_pileup () {
     local vcf_filename="${3}";
     local output_bam_filename="${4}";
     local barcode_tag="${5:-CB}";
+    local threads="${6:-8}";
 
     local exit_code=0;
 
     if [ ${#@} -lt 4 ] ; then
-        printf 'Usage:   filter_bam_file_for_popscle_dsc_pileup input_bam_filename barcodes_tsv_filename vcf_filename output_bam_filename [barcode_tag]\n\n';
+        printf 'Usage:   filter_bam_file_for_popscle_dsc_pileup input_bam_filename barcodes_tsv_filename vcf_filename output_bam_filename [barcode_tag] [threads]\n\n';
+        printf 'Arguments:\n';
+        printf '  - input_bam_filename:    Input (CellRanger) BAM file to filter.\n';
+        printf '  - barcodes_tsv_filename: File with cell barcodes to keep (can be gzipped).\n';
+        printf '  - vcf_filename:          VCF file with SNPs: only keep reads that overlap with those SNPs.\n';
+        printf '  - output_bam_filename:   Filtered output BAM file.\n';
+        printf '  - barcode_tag:           BAM tag which contains the cell barcode (default: "CB").\n';
+        printf '  - threads:               Number of extra threads for samtools (default: 8).\n\n';
         printf 'Purpose: Filter BAM file for usage with popscle dsc-pileup by keeping reads:\n';
         printf '           - which overlap with SNPs in the VCF file\n';
         printf '           - and which have a cell barcode (default: "CB" tag) contained in the cell barcode list\n';
@@ -100,6 +108,11 @@ filter_bam_file_for_popscle_dsc_pileup () {
         return 2;
     fi
 
+    if ! [[ "${threads}" =~ ^[0-9]+$ ]] ; then
+        printf 'Error: Number of threads "%s" should be a non-negative integer.\n' "${threads}" > /dev/stderr;
+        return 2;
+    fi
+
     # Check if bedtools and samtools are in PATH.
     if ! check_if_programs_exists ; then
         return 2;
@@ -110,11 +123,14 @@ filter_bam_file_for_popscle_dsc_pileup () {
     #     to a BED file and merge adjacent SNP regions to one.
     #   - Only include reads that contain a SNP position
     #     and which contain a cell barcode of interest.
+    #   - Use fast compression (level 1) as the filtered BAM file
+    #     is only an intermediate file for dsc-pileup.
     if [ "${barcodes_tsv_filename%.gz}".gz = "${barcodes_tsv_filename}" ] ; then
         # Barcodes file is compressed with gzip.
         bedtools merge -i "${vcf_filename}" \
           | samtools view\
-                -@ 8 \
+                -@ "${threads}" \
+                --output-fmt-option level=1 \
                 --write-index \
                 -L - \
                 -D "${barcode_tag}":<(zcat "${barcodes_tsv_filename}") \
@@ -129,7 +145,8 @@ filter_bam_file_for_popscle_dsc_pileup () {
         # Barcodes file is uncompressed.
         bedtools merge -i "${vcf_filename}" \
           | samtools view\
-                -@ 8 \
+                -@ "${threads}" \
+                --output-fmt-option level=1 \
                 --write-index \
                 -L - \
                 -D "${barcode_tag}":"${barcodes_tsv_filename}" \
@@ -147,24 +147,33 @@ sort_vcf_same_as_bam () {
     local bam_input_file="${1}";
     local vcf_input_file="${2}";
     local vcf_type="${3:-v}";
+    local threads="${4:-8}";
 
     if [ ${#@} -lt 2 ] ; then
-        printf 'Usage: sort_vcf_same_as_bam BAM_file VCF_file [VCF_type]\n\n';
+        printf 'Usage: sort_vcf_same_as_bam BAM_file VCF_file [VCF_type] [threads]\n\n';
         printf 'Arguments:\n';
         printf '  - BAM_file: BAM file from which to get the contig order to sort the VCF file.\n';
         printf '  - VCF_file: VCF file to sort by contig order as defined in the BAM file.\n';
         printf '  - VCF_type: VCF ouput file type (default: same as input VCF file type):\n';
         printf '              v: uncompressed VCF, z: compressed VCF,\n';
-        printf '              u: uncompressed BCF, b: compressed BCF\n\n';
+        printf '              u: uncompressed BCF, b: compressed BCF\n';
+        printf "              use '' to guess it from the input VCF filename (e.g. when setting threads).\n";
+        printf '  - threads:  Number of extra threads to use for compressing the VCF output (default: 8).\n';
+        printf '              Only used for compressed output (VCF_type: z or b).\n\n';
         printf 'Purpose:\n';
         printf '  Sort VCF file in the same order as the BAM file, so it can be used with popscle.\n\n';
         return 1;
     fi
 
+    if ! [[ "${threads}" =~ ^[0-9]+$ ]] ; then
+        printf 'Error: Number of threads "%s" should be a non-negative integer.\n' "${threads}" > /dev/stderr;
+        return 1;
+    fi
+
     check_if_programs_exists || return $?;
 
-    # If VCF type is not specified, try to guess it from the filename extension.
-    if [ ${#@} -eq 2 ] ; then
+    # If VCF type is not specified (or empty), try to guess it from the filename extension.
+    if [ -z "${3}" ] ; then
         if [ "${vcf_input_file%.vcf.gz}" != "${vcf_input_file}" ] ; then
             vcf_type='z';
         elif [ "${vcf_input_file%.bcf}" != "${vcf_input_file}" ] ; then
@@ -173,28 +182,46 @@ sort_vcf_same_as_bam () {
     fi
 
     # Sort VCF file by same chromosome order as BAM file.
-    cat <(
-          # Create new VCF header:
-          #   - Get VCF header of VCF input file.
-          #   - Remove all contig header lines and "#CHROM" line from the VCF header.
-          #   - Append contig headers in the order they appear in the input BAM file.
-          #   - Add "#CHROM" line as last line of the new VCF header.
-          bcftools view -h "${vcf_input_file}" \
-            | awk \
-                '
-                {
-                    if ($1 !~ /^##contig=/ && $1 !~ /^#CHROM/) {
-                        # Remove all contig header lines and "#CHROM" line.
-                        print $0;
-                    }
-                }' \
-            | cat \
-                - \
-                <(get_contig_order_from_bam "${bam_input_file}" 'vcf') \
-                <(bcftools view -h "${vcf_input_file}" | tail -n 1) \
-        ) \
-        <(bcftools view -H -O v "${vcf_input_file}") \
-      | bcftools sort -O "${vcf_type}";
+    # Write new VCF header and VCF records directly to the same pipe
+    # (instead of copying both through an extra "cat" process).
+    {
+        # Create new VCF header (reading the VCF header only once):
+        #   - Get VCF header of VCF input file.
+        #   - Remove all contig header lines from the VCF header.
+        #   - Insert contig headers in the order they appear in the input BAM file
+        #     just before the "#CHROM" line (last line of the VCF header).
+        bcftools view -h "${vcf_input_file}" \
+          | awk \
+              '
+              {
+                  if (FILENAME == ARGV[1]) {
+                      # Store contig header lines from the BAM file.
+                      contig_header_lines = contig_header_lines $0 "\n";
+                  } else if ($1 ~ /^#CHROM/) {
+                      # Add contig header lines before the "#CHROM" line.
+                      printf "%s", contig_header_lines;
+                      print $0;
+                  } else if ($1 !~ /^##contig=/) {
+                      # Remove all contig header lines.
+                      print $0;
+                  }
+              }' \
+              <(get_contig_order_from_bam "${bam_input_file}" 'vcf') \
+              -;
+
+        # Get VCF records of VCF input file.
+        bcftools view -H -O v "${vcf_input_file}";
+    } \
+      | if [ "${vcf_type}" = 'z' ] || [ "${vcf_type}" = 'b' ] ; then
+            # "bcftools sort" compresses its output with only one thread,
+            # so let "bcftools view" do the (BGZF) compression with multiple threads.
+            bcftools sort -O u \
+              | bcftools view --no-version --threads "${threads}" -O "${vcf_type}";
+
+            check_exit_codes;
+        else
+            bcftools sort -O "${vcf_type}";
+        fi
 
     check_exit_codes;
 